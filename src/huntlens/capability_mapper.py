@@ -17,21 +17,42 @@ Design notes:
 """
 
 from __future__ import annotations
-import re
-from typing import Dict, Optional
-
-_IP_RE = re.compile(
-    r"^(?:25[0-5]|2[0-4]\d|1?\d{1,2})(?:\.(?:25[0-5]|2[0-4]\d|1?\d{1,2})){3}$"
+import sys
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+try:
+    import re2 as _re  # linear-time matching, immune to catastrophic backtracking
+except ImportError:
+    import re as _re
+
+# Both patterns avoid lookaround so they compile under RE2 as well as `re`.
+_IP_RE = _re.compile(
+    r"^(?:25[0-5]|2[0-4][0-9]|1?[0-9]{1,2})"
+    r"(?:\.(?:25[0-5]|2[0-4][0-9]|1?[0-9]{1,2})){3}$"
 )
-_DOMAIN_RE = re.compile(
-    r"^(?=.{1,253}$)(?!-)(?:[A-Za-z0-9-]{1,63}(?<!-)\.)+[A-Za-z]{2,63}$"
+# Labels are 1-63 chars and never end in '-'; the first label also never
+# starts with '-'. Same language as the former lookaround form
+#   ^(?=.{1,253}$)(?!-)(?:[A-Za-z0-9-]{1,63}(?<!-)\.)+[A-Za-z]{2,63}$
+# except the 253-char cap, which classify_ioc() checks via len().
+_DOMAIN_RE = _re.compile(
+    r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,61}[A-Za-z0-9])?\."
+    r"(?:[A-Za-z0-9-]{0,62}[A-Za-z0-9]\.)*[A-Za-z]{2,63}$"
 )
-_SHA256_RE = re.compile(r"^[A-Fa-f0-9]{64}$")
-_SHA1_RE = re.compile(r"^[A-Fa-f0-9]{40}$")
-_MD5_RE = re.compile(r"^[A-Fa-f0-9]{32}$")
-_MITRE_RE = re.compile(r"^t\d{4}(?:\.\d{3})?$", re.IGNORECASE)
+# Hashes are recognised by length plus a hex-digit check, no regex needed.
+_HASH_BY_LEN = {64: "sha256", 40: "sha1", 32: "md5"}
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _looks_mitre(s: str) -> bool:
+    """Regex-free MITRE ID check: T1234 or T1234.567, case-insensitive."""
+    n = len(s)
+    if n not in (5, 9) or s[0] not in "Tt" or not s[1:5].isdecimal():
+        return False
+    return n == 5 or (s[5] == "." and s[6:].isdecimal())
 
 
+@lru_cache(maxsize=1024)
 def normalize_artifact_type(t: str) -> str:
     t = (t or "").strip().lower()
     aliases = {
@@ -49,71 +70,107 @@ def normalize_artifact_type(t: str) -> str:
     return aliases.get(t, t or "other")
 
 
+@lru_cache(maxsize=1024)
 def classify_ioc(artifact: str) -> Optional[str]:
     s = (artifact or "").strip()
-    if _IP_RE.match(s):
+    n = len(s)
+    # Length decides which checks can possibly match: hashes have fixed
+    # lengths, dotted quads are 7-15 chars, domains at least 4 ("a.io").
+    hash_kind = _HASH_BY_LEN.get(n)
+    if hash_kind and _HEX_DIGITS.issuperset(s):
+        return hash_kind
+    if 7 <= n <= 15 and _IP_RE.match(s):
         return "ip"
-    if _DOMAIN_RE.match(s):
+    if 4 <= n <= 253 and _DOMAIN_RE.match(s):
         return "domain"
-    if _SHA256_RE.match(s):
-        return "sha256"
-    if _SHA1_RE.match(s):
-        return "sha1"
-    if _MD5_RE.match(s):
-        return "md5"
     return None
 
 
-def _queries_for_ioc(artifact: str, ioc_type: str) -> Dict[str, str]:
-    # These are intentionally generic, platform-safe templates.
-    if ioc_type == "ip":
-        return {
-            "splunk": f"""index=* (dest_ip="{artifact}" OR src_ip="{artifact}") OR (dest="{artifact}" OR src="{artifact}")""",
-            "kql": f"""union isfuzzy=true
-  (SecurityEvent, DeviceNetworkEvents, CommonSecurityLog)
-  | where RemoteIP == "{artifact}" or DestinationIp == "{artifact}" or SourceIp == "{artifact}" """,
-            "eql": f"""network where destination.ip == "{artifact}" or source.ip == "{artifact}" """
-        }
-    if ioc_type == "domain":
-        return {
-            "splunk": f"""index=* (query="{artifact}" OR dest="{artifact}" OR url="*{artifact}*")""",
-            "kql": f"""union isfuzzy=true (DnsEvents, DeviceNetworkEvents)
-  | where Name == "{artifact}" or Url has "{artifact}" """,
-            "eql": f"""dns where dns.question.name == "{artifact}" or stringcontains(url.original, "{artifact}") """
-        }
-    if ioc_type in {"sha256", "sha1", "md5"}:
-        return {
-            "splunk": f"""index=* (file_hash="{artifact}" OR Hash="{artifact}" OR sha256="{artifact}" OR sha1="{artifact}" OR md5="{artifact}")""",
-            "kql": f"""union isfuzzy=true (DeviceFileEvents, DeviceProcessEvents)
-  | where SHA256 == "{artifact}" or SHA1 == "{artifact}" or MD5 == "{artifact}" """,
-            "eql": f"""file where file.hash.sha256 == "{artifact}" or file.hash.sha1 == "{artifact}" or file.hash.md5 == "{artifact}" """
-        }
-    # Fallback (should not hit)
+# Query templates are written with an {a} placeholder for the artifact and
+# split on it once at import into interned literal fragments; rendering is a
+# single artifact.join(fragments), with no format-string parsing per call.
+# They are intentionally generic, platform-safe templates.
+Fragments = Tuple[str, ...]
+
+
+def _compile(templates: Dict[str, str]) -> Dict[str, Fragments]:
     return {
-        "splunk": f'index=* "{artifact}"',
-        "kql": f"""union isfuzzy=true (*) | where tostring(*) has "{artifact}" """,
-        "eql": f"""any where stringcontains(string(all), "{artifact}") """
+        backend: tuple(sys.intern(part) for part in tpl.split("{a}"))
+        for backend, tpl in templates.items()
     }
 
 
+_HASH_TPL = _compile({
+    "splunk": 'index=* (file_hash="{a}" OR Hash="{a}" OR sha256="{a}" OR sha1="{a}" OR md5="{a}")',
+    "kql": """union isfuzzy=true (DeviceFileEvents, DeviceProcessEvents)
+  | where SHA256 == "{a}" or SHA1 == "{a}" or MD5 == "{a}" """,
+    "eql": 'file where file.hash.sha256 == "{a}" or file.hash.sha1 == "{a}" or file.hash.md5 == "{a}" ',
+})
+
+_IOC_TPL = {
+    "ip": _compile({
+        "splunk": 'index=* (dest_ip="{a}" OR src_ip="{a}") OR (dest="{a}" OR src="{a}")',
+        "kql": """union isfuzzy=true
+  (SecurityEvent, DeviceNetworkEvents, CommonSecurityLog)
+  | where RemoteIP == "{a}" or DestinationIp == "{a}" or SourceIp == "{a}" """,
+        "eql": 'network where destination.ip == "{a}" or source.ip == "{a}" ',
+    }),
+    "domain": _compile({
+        "splunk": 'index=* (query="{a}" OR dest="{a}" OR url="*{a}*")',
+        "kql": """union isfuzzy=true (DnsEvents, DeviceNetworkEvents)
+  | where Name == "{a}" or Url has "{a}" """,
+        "eql": 'dns where dns.question.name == "{a}" or stringcontains(url.original, "{a}") ',
+    }),
+    "sha256": _HASH_TPL,
+    "sha1": _HASH_TPL,
+    "md5": _HASH_TPL,
+}
+
+# Fallback for unknown IOC kinds (should not hit).
+_IOC_FALLBACK_TPL = _compile({
+    "splunk": 'index=* "{a}"',
+    "kql": 'union isfuzzy=true (*) | where tostring(*) has "{a}" ',
+    "eql": 'any where stringcontains(string(all), "{a}") ',
+})
+
+_PROCESS_TPL = _compile({
+    "splunk": 'index=* sourcetype=XmlWinEventLog:Microsoft-Windows-Sysmon/Operational EventCode=1 Image="*\\{a}" OR OriginalFileName="{a}" OR process_name="{a}" ',
+    "kql": """DeviceProcessEvents
+| where ProcessName =~ "{a}" or FileName =~ "{a}" or InitiatingProcessFileName =~ "{a}" """,
+    "eql": 'process where process.name == "{a}" or process.pe.original_file_name == "{a}" ',
+})
+
+# Generic technique anchors so analysts can refine.
+_MITRE_TPL = _compile({
+    "splunk": 'index=* ("{a}" OR "ATT&CK {a}")',
+    "kql": 'union isfuzzy=true (*) | where tostring(*) has "{a}" ',
+    "eql": 'any where stringcontains(string(all), "{a}") ',
+})
+
+# Keyword pivot shared by the repo and generic fallbacks.
+_KEYWORD_TPL = _compile({
+    "splunk": 'index=* "{a}"',
+    "kql": 'union isfuzzy=true (*) | where tostring(*) has "{a}"',
+    "eql": 'any where stringcontains(string(all), "{a}")',
+})
+
+
+def _render(templates: Dict[str, Fragments], artifact: str) -> Dict[str, str]:
+    a = str(artifact)
+    return {backend: a.join(parts) for backend, parts in templates.items()}
+
+
+def _queries_for_ioc(artifact: str, ioc_type: str) -> Dict[str, str]:
+    return _render(_IOC_TPL.get(ioc_type, _IOC_FALLBACK_TPL), artifact)
+
+
 def _queries_for_process(name: str) -> Dict[str, str]:
     safe = name.strip().strip('"').strip("'")
-    return {
-        "splunk": f"""index=* sourcetype=XmlWinEventLog:Microsoft-Windows-Sysmon/Operational EventCode=1 Image="*\\{safe}" OR OriginalFileName="{safe}" OR process_name="{safe}" """,
-        "kql": f"""DeviceProcessEvents
-| where ProcessName =~ "{safe}" or FileName =~ "{safe}" or InitiatingProcessFileName =~ "{safe}" """,
-        "eql": f"""process where process.name == "{safe}" or process.pe.original_file_name == "{safe}" """
-    }
+    return _render(_PROCESS_TPL, safe)
 
 
 def _queries_for_mitre(tech: str) -> Dict[str, str]:
-    t = tech.upper()
-    # Provide generic technique anchors so analysts can refine.
-    return {
-        "splunk": f"""index=* ("{t}" OR "ATT&CK {t}")""",
-        "kql": f"""union isfuzzy=true (*) | where tostring(*) has "{t}" """,
-        "eql": f"""any where stringcontains(string(all), "{t}") """
-    }
+    return _render(_MITRE_TPL, tech.upper())
 
 
 def generate_detection_queries(artifact: str, artifact_type: str) -> Dict[str, object]:
@@ -130,6 +187,24 @@ def generate_detection_queries(artifact: str, artifact_type: str) -> Dict[str, o
           "severity_hint": "low|medium|high"
         }
     """
+    a_type, fam, queries, rationale, sev = _detection_entry(artifact, artifact_type)
+    return {
+        "artifact": artifact,
+        "artifact_type": a_type,
+        "family": fam,
+        "queries": dict(queries),
+        "rationale": rationale,
+        "severity_hint": sev,
+    }
+
+
+@lru_cache(maxsize=4096)
+def _detection_entry(
+    artifact: str, artifact_type: str
+) -> Tuple[str, str, Tuple[Tuple[str, str], ...], str, str]:
+    # Memoized core of generate_detection_queries(); returns an immutable
+    # (artifact_type, family, queries, rationale, severity) tuple so the cached
+    # value cannot be mutated through the dict handed to callers.
     a_type = normalize_artifact_type(artifact_type)
     sev = "medium"
     rationale = ""
@@ -152,37 +227,21 @@ def generate_detection_queries(artifact: str, artifact_type: str) -> Dict[str, o
         rationale = "Process name triage; include parent/child correlation and command-line examination."
         sev = "medium"
         fam = "process"
-    elif a_type == "mitre" or _MITRE_RE.match(artifact or ""):
+    elif a_type == "mitre" or _looks_mitre(artifact or ""):
         queries = _queries_for_mitre(artifact)
         rationale = "Technique pivot; pair with telemetry-specific detections for the sub-technique."
         sev = "medium"
         fam = "mitre"
     elif a_type == "repo":
         # Without analysis, just keyword presence
-        queries = {
-            "splunk": f'index=* "{artifact}"',
-            "kql": f'union isfuzzy=true (*) | where tostring(*) has "{artifact}"',
-            "eql": f'any where stringcontains(string(all), "{artifact}")'
-        }
+        queries = _render(_KEYWORD_TPL, artifact)
         rationale = "Repository keyword pivot; combine with code/parser analysis to derive concrete behaviors."
         sev = "low"
         fam = "repo"
     else:
-        queries = {
-            "splunk": f'index=* "{artifact}"',
-            "kql": f'union isfuzzy=true (*) | where tostring(*) has "{artifact}"',
-            "eql": f'any where stringcontains(string(all), "{artifact}")'
-        }
+        queries = _render(_KEYWORD_TPL, artifact)
         rationale = "Generic keyword pivot; refine by telemetry source and timeframe."
         sev = "low"
         fam = "other"
 
-    return {
-        "artifact": artifact,
-        "artifact_type": a_type,
-        "family": fam,
-        "queries": queries,
-        "rationale": rationale,
-        "severity_hint": sev,
-    }
-
+    return a_type, fam, tuple(queries.items()), rationale, sev
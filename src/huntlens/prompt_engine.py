@@ -21,7 +21,57 @@ Safety Rules:
 """
 
 import json
+from enum import Enum
 from typing import Dict, Optional
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json is the reference encoder
+    orjson = None
+
+# orjson serializes datetimes and dataclasses natively; stdlib json does not.
+# Passing them through makes orjson refuse them too, so they take the stdlib
+# path and raise TypeError whichever backend is installed.
+_ORJSON_OPTS = (
+    orjson.OPT_INDENT_2
+    | orjson.OPT_SORT_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def _json_default(obj):
+    # The two types orjson always encodes natively (no passthrough option
+    # exists); stdlib json encodes them the same way here.
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps(obj) -> str:
+    """
+    Serialize obj as indented JSON with sorted keys (stable prompt text).
+
+    orjson is used when installed; anything it refuses (ints beyond 64 bits,
+    non-str keys, datetimes, dataclasses) goes through stdlib json instead.
+    Both backends accept the same contexts: JSON types plus UUID (as its
+    string) and Enum (as its value); anything else raises TypeError. The text
+    is the same from both except for floats: orjson writes NaN/Infinity as
+    null and formats exponents differently (1e20 vs 1e+20, 0.00001 vs 1e-05).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTS).decode("utf-8")
+        except (orjson.JSONEncodeError, TypeError):
+            pass
+    return json.dumps(
+        obj, indent=2, sort_keys=True, ensure_ascii=False, default=_json_default
+    )
 
 
 def build_prompt(artifact: str, artifact_type: str, context: Optional[Dict] = None) -> str:
@@ -38,7 +88,7 @@ def build_prompt(artifact: str, artifact_type: str, context: Optional[Dict] = No
     """
     safe_artifact = artifact.strip()
     safe_type = artifact_type.strip().lower()
-    ctx = json.dumps(context, indent=2) if context else "{}"
+    ctx = _dumps(context) if context else "{}"
 
     return (
         f"You are HuntLens, an AI SOC copilot.\n"
@@ -63,6 +113,6 @@ def build_playbook_prompt(validated_data: Dict) -> str:
     return (
         "You are HuntLens. Based on the following validated SOC input, "
         "generate a structured playbook aligned with schema.json.\n\n"
-        f"{json.dumps(validated_data, indent=2)}"
+        f"{_dumps(validated_data)}"
     )
 
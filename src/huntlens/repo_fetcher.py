@@ -7,24 +7,235 @@ Purpose:
 
 Functions:
 1. fetch_repo_snapshot(url: str, branch: str = "main", max_commits: int = 5) -> dict
-    - Clone a repo shallowly into a temp directory.
-    - Extract README (if available), list of files (limit 5MB each), and last N commit messages.
+    - Clone a repo shallowly into a temp directory (blobless partial clone).
+    - Extract README (if available), list of tracked files, and last N commit messages.
     - Return a structured dict.
 
 2. cleanup_repo(path: str) -> None
-    - Delete the temporary repo safely.
+    - Delete the temporary repo safely (in the background, after renaming it aside).
 
 Safety:
-- Always shallow clone (depth=1).
+- Always shallow clone (depth=1) without file contents (--filter=blob:none) and
+  without a checkout; only the README blob is ever downloaded.
+- With pygit2 installed, the file list and commits are read in-process through
+  libgit2; otherwise (or if libgit2 cannot open the clone) the git CLI is used.
+  The README always goes through `git cat-file`, since libgit2 cannot fetch
+  the missing blob from a partial clone.
 - Never execute repo code.
-- Gracefully handle missing branch, missing README, and large files.
+- Gracefully handle missing branch, missing README, and large files (a README
+  over MAX_README_BYTES, or one that looks binary, is skipped).
 """
 
 import os
+import subprocess
 import tempfile
 import shutil
-from typing import Dict, List, Optional
-from git import Repo, GitCommandError
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Union
+
+try:
+    import pygit2
+except ImportError:  # optional: fall back to the git CLI
+    pygit2 = None
+
+GIT_TIMEOUT = 60  # seconds per git invocation
+# Never block on credential prompts for private/missing repos.
+_GIT_ENV = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+README_NAMES = ["README.md", "readme.md", "README"]
+MAX_README_BYTES = 1 << 20  # larger README blobs are skipped, not read
+_SNIFF_BYTES = 512  # a NUL byte in this prefix marks a blob as binary
+
+
+def _git(*args: str, cwd: Optional[str] = None, errors: str = "surrogateescape") -> str:
+    """
+    Run a git command and return its stdout; raise on failure or timeout.
+
+    Output is decoded as UTF-8; by default undecodable bytes (e.g. Latin-1 file
+    names) become surrogate escapes, as pygit2 and os.walk return them.
+    """
+    result = subprocess.run(
+        ["git", *args],
+        cwd=cwd,
+        check=True,
+        capture_output=True,
+        encoding="utf-8",
+        errors=errors,
+        timeout=GIT_TIMEOUT,
+        env=_GIT_ENV,
+    )
+    return result.stdout
+
+
+def _clone(url: str, dest: str, branch: Optional[str]) -> None:
+    # Partial clone without checkout: only the one branch's tip commit and
+    # trees are fetched up front; blobs are fetched on demand when _CatFile
+    # asks for them. (--depth implies --single-branch; it is spelled out so
+    # the fetch stays limited to one ref if the depth is ever changed.)
+    args = [
+        "clone",
+        "--quiet",
+        "--depth=1",
+        "--single-branch",
+        "--filter=blob:none",
+        "--no-checkout",
+    ]
+    if branch:
+        args += ["--branch", branch]
+    _git(*args, url, dest)
+
+
+def _open_repo(repo_dir: str) -> Optional["pygit2.Repository"]:
+    """An in-process libgit2 handle on the clone, or None to use the git CLI."""
+    if pygit2 is None:
+        return None
+    try:
+        return pygit2.Repository(repo_dir)
+    except pygit2.GitError:
+        return None
+
+
+def _walk_tree(repo: "pygit2.Repository", tree, prefix: str) -> Iterator[str]:
+    # Same paths and order as `git ls-tree -r --name-only`.
+    for entry in tree:
+        if entry.type == pygit2.GIT_OBJECT_TREE:
+            yield from _walk_tree(repo, repo[entry.id], f"{prefix}{entry.name}/")
+        else:
+            yield prefix + entry.name
+
+
+def _list_files(repo_dir: str) -> List[str]:
+    # Reads the tree objects only; no blob is fetched to enumerate paths.
+    repo = _open_repo(repo_dir)
+    if repo is not None:
+        try:
+            return list(_walk_tree(repo, repo.head.peel(pygit2.Commit).tree, ""))
+        except (pygit2.GitError, KeyError, ValueError):
+            pass  # e.g. unborn HEAD; let the CLI have a go
+    try:
+        out = _git("ls-tree", "-r", "-z", "--name-only", "HEAD", cwd=repo_dir)
+    except (subprocess.SubprocessError, OSError):
+        return []
+    return [p for p in out.split("\0") if p]
+
+
+class _CatFile:
+    """
+    One long-lived `git cat-file --batch` process for reading many objects,
+    instead of a `git show` spawn per object.
+
+    In a partial clone a read may fetch the blob from the remote, so the
+    process is killed once it has lived GIT_TIMEOUT seconds, like every other
+    git call; reads then return None.
+    """
+
+    def __init__(self, repo_dir: str):
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=_GIT_ENV,
+        )
+        self._watchdog = threading.Timer(GIT_TIMEOUT, self._proc.kill)
+        self._watchdog.daemon = True
+        self._watchdog.start()
+
+    def read_blob(self, spec: str, max_bytes: Optional[int] = None) -> Optional[bytes]:
+        """
+        Return the blob named by spec (e.g. "HEAD:README.md"), or None if it is
+        missing, not a blob, or larger than max_bytes.
+        """
+        try:
+            self._proc.stdin.write(spec.encode("utf-8") + b"\n")
+            self._proc.stdin.flush()
+        except BrokenPipeError:  # killed by the watchdog
+            return None
+        # "<oid> <type> <size>\n" then <size> bytes and "\n"; or "<spec> missing\n"
+        header = self._proc.stdout.readline().split()
+        if len(header) != 3:
+            return None
+        _, obj_type, size = header
+        size = int(size)
+        if obj_type != b"blob" or (max_bytes is not None and size > max_bytes):
+            # The header already gave the size: discard the body without
+            # buffering it, keeping the pipe in sync for the next request.
+            self._discard(size + 1)
+            return None
+        data = self._proc.stdout.read(size + 1)
+        # A short read means the process died mid-blob.
+        return data[:-1] if len(data) == size + 1 else None
+
+    def _discard(self, n: int) -> None:
+        while n > 0:
+            chunk = self._proc.stdout.read(min(n, 1 << 16))
+            if not chunk:
+                break
+            n -= len(chunk)
+
+    def close(self) -> None:
+        self._watchdog.cancel()
+        try:
+            self._proc.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self._proc.wait(timeout=GIT_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+    def __enter__(self) -> "_CatFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _decode_text(data: bytes) -> str:
+    # UTF-8 with undecodable bytes dropped and newlines normalized to "\n".
+    text = data.decode("utf-8", "ignore")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _read_readme(repo_dir: str) -> Optional[str]:
+    try:
+        with _CatFile(repo_dir) as cat:
+            for name in README_NAMES:
+                data = cat.read_blob(f"HEAD:{name}", max_bytes=MAX_README_BYTES)
+                if data is not None and b"\0" not in data[:_SNIFF_BYTES]:
+                    return _decode_text(data)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _recent_commits(repo_dir: str, max_commits: int) -> List[str]:
+    repo = _open_repo(repo_dir)
+    if repo is not None:
+        try:
+            walker = repo.walk(repo.head.target, pygit2.GIT_SORT_TIME)
+            return [c.message.strip() for c in islice(walker, max_commits)]
+        except (pygit2.GitError, KeyError, ValueError):
+            pass
+    # One `git log` process for all messages; -z terminates each %B body with NUL.
+    try:
+        out = _git(
+            "log",
+            "-z",
+            f"--max-count={max_commits}",
+            "--format=%B",
+            cwd=repo_dir,
+            errors="replace",  # a bad message must not fail the snapshot
+        )
+    except (subprocess.SubprocessError, OSError):
+        return []
+    return [msg.strip() for msg in out.split("\0")[:-1]]
 
 
 def fetch_repo_snapshot(url: str, branch: str = "main", max_commits: int = 5) -> Dict:
@@ -52,41 +263,32 @@ def fetch_repo_snapshot(url: str, branch: str = "main", max_commits: int = 5) ->
 
     # Try branch first, fallback to default
     try:
-        repo = Repo.clone_from(url, tmp_dir, branch=branch, depth=1)
-    except GitCommandError:
+        _clone(url, tmp_dir, branch)
+    except (subprocess.SubprocessError, OSError):
         try:
-            repo = Repo.clone_from(url, tmp_dir, depth=1)  # let Git pick default branch
-        except GitCommandError as e:
+            _clone(url, tmp_dir, None)  # let Git pick default branch
+        except (subprocess.SubprocessError, OSError) as e:
             shutil.rmtree(tmp_dir, ignore_errors=True)
-            raise ValueError(f"Failed to clone repo: {e}")
-
-    # Try to extract README
-    readme_content = None
-    for name in ["README.md", "readme.md", "README"]:
-        path = os.path.join(tmp_dir, name)
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8", errors="ignore") as f:
-                readme_content = f.read()
-            break
-
-    # Collect small file paths
-    file_list: List[str] = []
-    for root, _, files in os.walk(tmp_dir):
-        for file in files:
-            full_path = os.path.join(root, file)
-            rel_path = os.path.relpath(full_path, tmp_dir)
-            try:
-                if os.path.getsize(full_path) <= 5 * 1024 * 1024:  # 5MB max
-                    file_list.append(rel_path)
-            except OSError:
-                continue
-
-    # Get last N commits (may fail if no history)
-    commits = []
+            detail = getattr(e, "stderr", None) or e
+            raise ValueError(f"Failed to clone repo: {str(detail).strip()}")
+
+    # The three extractions are independent git processes, so run them side by
+    # side and overlap their startup and (for the README blob) fetch latency.
     try:
-        commits = [c.message.strip() for c in repo.iter_commits(max_count=max_commits)]
-    except Exception:
-        pass
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            # README: only its blob is fetched, through one cat-file pipe
+            readme_future = pool.submit(_read_readme, tmp_dir)
+            # Tracked file paths, straight from the tree (no working-tree walk)
+            files_future = pool.submit(_list_files, tmp_dir)
+            # Last N commits (may be empty if there is no history)
+            commits_future = pool.submit(_recent_commits, tmp_dir, max_commits)
+            readme_content = readme_future.result()
+            file_list = files_future.result()
+            commits = commits_future.result()
+    except BaseException:
+        # The caller never gets the path, so it could not clean up the clone.
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
 
     return {
         "url": url,
@@ -97,8 +299,29 @@ def fetch_repo_snapshot(url: str, branch: str = "main", max_commits: int = 5) ->
     }
 
 
-def cleanup_repo(path: str) -> None:
+def cleanup_repo(path: Union[str, os.PathLike]) -> None:
     """
     Remove the temporary repo directory.
+
+    The directory is first renamed aside, so `path` no longer exists when this
+    returns; the (possibly slow) recursive delete then runs on a daemon thread.
+
+    Raises:
+        ValueError: If path is empty or the filesystem root.
     """
-    shutil.rmtree(path, ignore_errors=True)
+    base = os.fspath(path).rstrip(os.sep)
+    if not base:
+        raise ValueError(f"Refusing to remove {os.fspath(path)!r}")
+    tombstone = f"{base}.deleting"
+    try:
+        os.rename(path, tombstone)
+    except OSError:
+        # Missing path or rename not possible: delete in place, synchronously.
+        shutil.rmtree(path, ignore_errors=True)
+        return
+    threading.Thread(
+        target=shutil.rmtree,
+        args=(tombstone,),
+        kwargs={"ignore_errors": True},
+        daemon=True,
+    ).start()
@@ -10,8 +10,9 @@ Functions:
 1. load_corpus() -> List[dict]
    - Loads all JSON docs from data/golden_set and data/corpus.
 2. search(query: str, max_results: int = 3) -> List[dict]
-   - Simple keyword-based search over the corpus.
-   - Returns ranked results with match scores.
+   - BM25 keyword search over an inverted index built at corpus load.
+   - Adds docs that only contain the query as a literal substring, ranked below.
+   - Returns ranked results with match kinds and scores.
 
 Notes:
 - Hybrid search placeholder (can later be swapped for embeddings/vector DB).
@@ -19,58 +20,239 @@ Notes:
 """
 
 import os
-import json
 import re
-from typing import List, Dict
+import json
+import heapq
+import math
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json parses the same documents
+    orjson = None
 
 DATA_DIRS = [
     os.path.join(os.path.dirname(__file__), "..", "..", "data", "golden_set"),
     os.path.join(os.path.dirname(__file__), "..", "..", "data", "corpus"),
 ]
 
-def load_corpus() -> List[Dict]:
+_TOKEN_RE = re.compile(r"[a-z0-9_.:/-]{3,}")
+_BM25_K1 = 1.5
+_BM25_B = 0.75
+
+
+class _Corpus(NamedTuple):
+    docs: List[Dict]
+    text: List[str]  # lower-cased JSON of each doc, serialized once per load
+    # Inverted index: token -> {doc_idx: term_frequency}, plus BM25 lengths.
+    postings: Dict[str, Dict[int, int]]
+    doc_len: List[int]
+    avg_doc_len: float
+
+
+def _build_index(
+    texts: List[str],
+) -> Tuple[Dict[str, Dict[int, int]], List[int], float]:
+    postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+    doc_len = []
+    for idx, text in enumerate(texts):
+        tokens = _TOKEN_RE.findall(text)
+        doc_len.append(len(tokens))
+        for tok, tf in Counter(tokens).items():
+            postings[tok][idx] = tf
+    avg_doc_len = (sum(doc_len) / len(doc_len)) if doc_len else 0.0
+    return dict(postings), doc_len, avg_doc_len
+
+
+def _bm25(corpus: _Corpus, terms: List[str]) -> Dict[int, float]:
+    """Score the docs that contain every term; empty if any term is unindexed."""
+    lists = [corpus.postings.get(t) for t in terms]
+    if not lists or not all(lists):
+        return {}
+    # Intersect from the rarest term up so the candidate set starts small and
+    # an empty intersection exits early; scoring then touches candidates only.
+    lists.sort(key=len)
+    candidates = set(lists[0])
+    for plist in lists[1:]:
+        candidates.intersection_update(plist)
+        if not candidates:
+            return {}
+
+    n_docs = len(corpus.doc_len)
+    avg_doc_len = corpus.avg_doc_len or 1
+    idfs = [math.log(1 + (n_docs - len(p) + 0.5) / (len(p) + 0.5)) for p in lists]
+    scores: Dict[int, float] = {}
+    for idx in sorted(candidates):
+        norm = 1 - _BM25_B + _BM25_B * corpus.doc_len[idx] / avg_doc_len
+        scores[idx] = sum(
+            idf * plist[idx] * (_BM25_K1 + 1) / (plist[idx] + _BM25_K1 * norm)
+            for idf, plist in zip(idfs, lists)
+        )
+    return scores
+
+
+def _corpus_signature(dirs: Tuple[str, ...]) -> Tuple:
     """
-    Load all JSON documents from data directories.
-    Returns: List of dicts with keys {id, source, content}.
+    Cheap fingerprint of the corpus on disk: (dir, ((file, mtime_ns, size), ...)).
+    Costs one scandir + stat per file instead of a full JSON parse.
     """
-    docs = []
-    for d in DATA_DIRS:
+    sig = []
+    for d in dirs:
         if not os.path.exists(d):
             continue
-        for f in os.listdir(d):
-            if f.endswith(".json"):
-                path = os.path.join(d, f)
-                try:
-                    with open(path, "r") as fh:
-                        content = json.load(fh)
-                    docs.append({
-                        "id": f,
-                        "source": d,
-                        "content": content
-                    })
-                except Exception as e:
-                    print(f"Warning: failed to load {path}: {e}")
+        entries = []
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((entry.name, st.st_mtime_ns, st.st_size))
+        sig.append((d, tuple(sorted(entries))))
+    return tuple(sig)
+
+
+def _load_json(path: str) -> Tuple[object, Optional[Exception]]:
+    try:
+        with open(path, "rb") as fh:
+            data = fh.read()
+        return (orjson.loads(data) if orjson is not None else json.loads(data)), None
+    except Exception as e:
+        return None, e
+
+
+def _search_text(content: object) -> str:
+    # Compact, non-ASCII-preserving JSON; the stdlib fallback is set up to give
+    # the same text as orjson so matching does not depend on which is installed.
+    if orjson is not None:
+        return orjson.dumps(content).decode("utf-8").lower()
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).lower()
+
+
+def _read_corpus(dirs: Tuple[str, ...]) -> List[Dict]:
+    paths = [
+        (d, f, os.path.join(d, f))
+        for d in dirs
+        if os.path.exists(d)
+        for f in os.listdir(d)
+        if f.endswith(".json")
+    ]
+    if not paths:
+        return []
+    # Many small files: overlap the open/read latency on a small thread pool.
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as pool:
+        loaded = list(pool.map(_load_json, [path for _, _, path in paths]))
+
+    docs = []
+    for (d, f, path), (content, err) in zip(paths, loaded):
+        if err is not None:
+            print(f"Warning: failed to load {path}: {err}")
+            continue
+        docs.append({
+            "id": f,
+            "source": d,
+            "content": content
+        })
     return docs
 
+
+# One (signature, corpus) entry per DATA_DIRS tuple, least recently used
+# first; a changed signature replaces the entry instead of adding one.
+_CORPUS_CACHE_SIZE = 8
+_corpus_cache: Dict[Tuple[str, ...], Tuple[Tuple, _Corpus]] = {}
+_corpus_lock = threading.Lock()
+
+
+def _copy_doc(obj):
+    # Parsed JSON holds only dicts, lists and immutable scalars, so this is a
+    # full deep copy at a fraction of copy.deepcopy's cost.
+    if isinstance(obj, dict):
+        return {k: _copy_doc(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_copy_doc(v) for v in obj]
+    return obj
+
+
+def _build_corpus(dirs: Tuple[str, ...]) -> _Corpus:
+    docs = _read_corpus(dirs)
+    text = [_search_text(doc["content"]) for doc in docs]
+    return _Corpus(docs, text, *_build_index(text))
+
+
+def _corpus() -> _Corpus:
+    dirs = tuple(DATA_DIRS)
+    sig = _corpus_signature(dirs)
+    with _corpus_lock:
+        # Popped first so a stale corpus is released before its replacement
+        # is built, and re-inserted to mark it most recently used.
+        cached = _corpus_cache.pop(dirs, None)
+        corpus = cached[1] if cached and cached[0] == sig else _build_corpus(dirs)
+        _corpus_cache[dirs] = (sig, corpus)
+        while len(_corpus_cache) > _CORPUS_CACHE_SIZE:
+            del _corpus_cache[next(iter(_corpus_cache))]
+    return corpus
+
+
+def load_corpus() -> List[Dict]:
+    """
+    Load all JSON documents from data directories.
+    Parsed docs are cached per DATA_DIRS and reloaded (replacing the cached
+    copy) when the on-disk fingerprint changes; load_corpus.cache_clear()
+    drops the cache.
+    Returns: List of dicts with keys {id, source, content}; these are copies,
+    so callers may modify them without affecting the cache.
+    """
+    return [_copy_doc(doc) for doc in _corpus().docs]
+
+
+load_corpus.cache_clear = _corpus_cache.clear
+
+
 def search(query: str, max_results: int = 3) -> List[Dict]:
     """
     Search corpus for documents matching the query.
-    Very simple scoring: count of keyword matches in JSON string.
+    Scoring: BM25 over the inverted index for docs holding every query token,
+    ranked first; then docs that only contain the query as a literal substring
+    (e.g. "mimikatz" inside "mimikatz.exe"), ranked by match count.
+
+    Each result carries:
+        match_kind: "token" (BM25 hit) or "substring" (literal-only hit).
+        match_score: BM25 score (float) for "token", match count (int) for
+            "substring". Scores are only comparable within one kind; results
+            are ordered by (match_kind == "token", match_score), descending.
     """
-    corpus = load_corpus()
-    scored = []
-    for doc in corpus:
-        text = json.dumps(doc["content"]).lower()
-        q = query.lower()
-        score = len(re.findall(re.escape(q), text))
-        if score > 0:
-            scored.append({
-                "id": doc["id"],
-                "source": doc["source"],
-                "match_score": score,
-                "content": doc["content"]
-            })
-    # sort high → low
-    scored = sorted(scored, key=lambda x: x["match_score"], reverse=True)
-    return scored[:max_results]
+    corpus = _corpus()
+    q = query.lower()
+
+    ranked = _bm25(corpus, sorted(set(_TOKEN_RE.findall(q))))
+    # Tokens keep "." and "/", so a token search alone would miss substring
+    # hits the literal count finds; merge those in below the BM25 hits.
+    literal = _literal_scores(corpus, q)
+    scores = {idx: (True, score) for idx, score in ranked.items()}
+    for idx, count in literal.items():
+        scores.setdefault(idx, (False, count))
+    top = heapq.nlargest(max_results, scores.items(), key=lambda kv: kv[1])
+    return [
+        {
+            "id": corpus.docs[idx]["id"],
+            "source": corpus.docs[idx]["source"],
+            "match_kind": "token" if is_token else "substring",
+            "match_score": score,
+            "content": _copy_doc(corpus.docs[idx]["content"])
+        }
+        for idx, (is_token, score) in top
+    ]
 
+
+def _literal_scores(corpus: _Corpus, q: str) -> Dict[int, int]:
+    # str.count is a C-level scan of the text serialized once at load.
+    scores = {}
+    for idx, text in enumerate(corpus.text):
+        score = text.count(q)
+        if score > 0:
+            scores[idx] = score
+    return scores
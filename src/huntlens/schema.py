@@ -10,18 +10,40 @@ Functions:
 - get_schema() -> dict
     Return the schema loaded from docs/schema.json.
 - ensure_schema(obj: dict) -> dict
-    Validate obj against schema.json using jsonschema.
+    Validate obj against schema.json using a validator compiled once at import
+    (fastjsonschema when installed, jsonschema otherwise).
     Raise ValidationError if invalid, otherwise return obj unchanged.
+    This is the fast path used in production: it stops at the first error.
+- ensure_schema_bytes(buf: bytes) -> dict
+    Parse raw JSON (orjson when installed) and validate it with ensure_schema().
+- collect_errors(obj: dict) -> list
+    Return every ValidationError for obj (empty if valid). Diagnostics only:
+    it walks the whole instance even after the first failure.
+- reset_validator() -> None
+    Rebuild the cached validators after the schema dict is modified.
 
 Safety rules:
 - Never modify input objects.
 - Fail fast on invalid fields.
 - Schema is the single source of truth for playbook structure.
+- The schema is meta-validated and compiled once; there is no per-call schema
+  argument, so validation never pays for checking the schema again.
 """
 
 import os
 import json
-from jsonschema import validate, ValidationError
+from functools import lru_cache
+from jsonschema import Draft7Validator, ValidationError
+
+try:
+    import fastjsonschema
+except ImportError:  # optional accelerator; fall back to a cached jsonschema validator
+    fastjsonschema = None
+
+try:
+    import orjson
+except ImportError:  # optional accelerator; stdlib json parses the same documents
+    orjson = None
 
 # Resolve schema path relative to repo root
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -42,6 +64,59 @@ def get_schema() -> dict:
     return _schema
 
 
+def _build_validators() -> None:
+    # Built once, not per call: jsonschema.validate() would re-create the
+    # validator (and re-check the schema) every time. The schema itself is
+    # checked against the Draft 7 meta-schema here, once per build, so a bad
+    # schema fails at import rather than on first use. Defaults are not
+    # injected so input objects are never modified.
+    global _validator, _fast_validate
+    schema = get_schema()
+    Draft7Validator.check_schema(schema)
+    _validator = Draft7Validator(schema)
+    _fast_validate = (
+        _compile_fast(json.dumps(schema, sort_keys=True, separators=(",", ":")))
+        if fastjsonschema is not None
+        else None
+    )
+
+
+@lru_cache(maxsize=8)
+def _compile_fast(canonical_schema: str):
+    # fastjsonschema generates and exec()s Python source, which is far slower
+    # than validating; keyed on the canonical JSON text, so reset_validator()
+    # only pays for it again when the schema content actually changed.
+    return fastjsonschema.compile(
+        json.loads(canonical_schema), use_default=False, use_formats=False
+    )
+
+
+def reset_validator() -> None:
+    """
+    Rebuild the cached validators from get_schema().
+
+    Only needed when the schema dict is changed in place (e.g. in tests);
+    ensure_schema() otherwise keeps using the validators built at import.
+    The schema is re-checked against the meta-schema here (raising
+    jsonschema.SchemaError if invalid), never per ensure_schema() call.
+    """
+    _build_validators()
+
+
+_build_validators()
+
+
+def _has_tuple(obj) -> bool:
+    # fastjsonschema accepts tuples as arrays; jsonschema, the reference engine
+    # (and the one collect_errors() uses), does not. Such objects are sent to
+    # jsonschema so both paths, and collect_errors(), give the same verdict.
+    if isinstance(obj, dict):
+        return any(_has_tuple(v) for v in obj.values())
+    if isinstance(obj, list):
+        return any(_has_tuple(v) for v in obj)
+    return isinstance(obj, tuple)
+
+
 def ensure_schema(obj: dict) -> dict:
     """
     Validate an object against the HuntLens schema.
@@ -55,5 +130,45 @@ def ensure_schema(obj: dict) -> dict:
     Raises:
         jsonschema.ValidationError: If validation fails.
     """
-    validate(instance=obj, schema=_schema)
+    if _fast_validate is None or _has_tuple(obj):
+        _validator.validate(obj)
+        return obj
+    try:
+        _fast_validate(obj)
+    except fastjsonschema.JsonSchemaException as e:
+        raise ValidationError(e.message) from e
     return obj
+
+
+def ensure_schema_bytes(buf: bytes) -> dict:
+    """
+    Parse a raw JSON document and validate it against the HuntLens schema.
+
+    Args:
+        buf (bytes | str): JSON text, e.g. an LLM response or a file's bytes.
+
+    Returns:
+        dict: The parsed object if validation succeeds.
+
+    Raises:
+        ValueError: If buf is not valid JSON (json.JSONDecodeError).
+        jsonschema.ValidationError: If validation fails.
+    """
+    obj = orjson.loads(buf) if orjson is not None else json.loads(buf)
+    return ensure_schema(obj)
+
+
+def collect_errors(obj: dict) -> list:
+    """
+    Collect all schema violations in an object, for diagnostics only.
+
+    Unlike ensure_schema(), this does not stop at the first error, so it walks
+    the whole instance; use ensure_schema() on hot paths.
+
+    Args:
+        obj (dict): Candidate playbook-like object.
+
+    Returns:
+        list: jsonschema.ValidationError instances, empty if obj is valid.
+    """
+    return list(_validator.iter_errors(obj))
@@ -0,0 +1,45 @@
+import os
+import subprocess
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="run tests marked @pytest.mark.network (they reach remote hosts)",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-network"):
+        return
+    skip = pytest.mark.skip(reason="needs --run-network")
+    for item in items:
+        if "network" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope="session")
+def dummy_git_repo(tmp_path_factory):
+    """
+    A local git repo with a README and one commit on `main`, built once per
+    session. Tests must treat it as read-only (clone it via file://).
+    """
+    repo_dir = tmp_path_factory.mktemp("dummy_repo")
+    (repo_dir / "README.md").write_text("# Dummy Repo\n\nThis is a test.")
+
+    # Init git repo (force branch to main for test consistency) in one shell
+    # process; global config is ignored so no user identity is required.
+    subprocess.run(
+        [
+            "bash", "-c",
+            "set -e; git init -q; git branch -m main; git add README.md; "
+            "git -c user.email=t@t -c user.name=t commit -q -m init",
+        ],
+        cwd=repo_dir,
+        check=True,
+        env={**os.environ, "GIT_CONFIG_GLOBAL": "/dev/null", "GIT_OPTIONAL_LOCKS": "0"},
+    )
+    return repo_dir
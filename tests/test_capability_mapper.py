@@ -14,6 +14,14 @@ def test_classify_ioc_variants():
     assert cm.classify_ioc("not-an-ioc") is None
 
 
+def test_classify_ioc_near_misses():
+    assert cm.classify_ioc("g" * 32) is None  # hash length, not hex
+    assert cm.classify_ioc("ab cd" * 8) is None  # hash length, embedded spaces
+    assert cm.classify_ioc("256.1.1.1") is None
+    assert cm.classify_ioc("\u0661.\u0661.\u0661.\u0661") is None  # non-ASCII digits
+    assert cm.classify_ioc("a" * 250 + ".com") is None  # over 253 chars
+
+
 def test_generate_for_ip():
     res = cm.generate_detection_queries("10.10.10.10", "ioc")
     q = res["queries"]
@@ -47,3 +55,10 @@ def test_generate_for_repo_keyword():
     assert res["family"] == "repo"
     assert "SharpHound" in res["queries"]["splunk"]
 
+
+def test_generate_returns_independent_copies():
+    first = cm.generate_detection_queries("evil.example.com", "ioc")
+    first["queries"]["splunk"] = "mutated"
+    second = cm.generate_detection_queries("evil.example.com", "ioc")
+    assert second["queries"]["splunk"] != "mutated"
+    assert "evil.example.com" in second["queries"]["splunk"]
@@ -1,4 +1,9 @@
+import dataclasses
+import datetime
+import enum
+import json
 import re
+import uuid
 import pytest
 from src.huntlens import prompt_engine
 
@@ -25,3 +30,70 @@ def test_build_playbook_prompt():
     assert "mimikatz" in text
     assert "validated SOC input" in text
 
+
+CONTEXT = {
+    "repo": {"url": "file:///tmp/x", "files": ["README.md", "src/é.py"]},
+    "commits": ["init", "add feature"],
+    "stars": 12,
+    "fork": False,
+    "license": None,
+    "ports": {"443": "https", "80": "http"},
+}
+
+
+def test_dumps_matches_across_backends(monkeypatch):
+    fast = prompt_engine._dumps(CONTEXT)
+    monkeypatch.setattr(prompt_engine, "orjson", None)
+    assert prompt_engine._dumps(CONTEXT) == fast
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+
+
+@pytest.mark.parametrize(
+    "ctx",
+    [{"n": 2**70}, {1: "a", 2: "b"}, {"seen": datetime.datetime(2024, 1, 1)}],
+)
+def test_dumps_falls_back_to_stdlib_json(ctx):
+    # orjson refuses these (int over 64 bits, non-str keys, passed-through
+    # datetimes), so stdlib json decides: it encodes the first two and raises
+    # TypeError on the datetime.
+    try:
+        expected = json.dumps(ctx, indent=2, sort_keys=True, ensure_ascii=False)
+    except TypeError:
+        with pytest.raises(TypeError):
+            prompt_engine._dumps(ctx)
+        return
+    assert prompt_engine._dumps(ctx) == expected
+    assert expected in prompt_engine.build_prompt("repo", "git", context=ctx)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize(
+    "ctx", [{"seen": datetime.datetime(2024, 1, 1)}, {"point": Point(1)}]
+)
+def test_dumps_rejects_non_json_types_on_both_backends(ctx, use_orjson, monkeypatch):
+    if not use_orjson:
+        monkeypatch.setattr(prompt_engine, "orjson", None)
+    with pytest.raises(TypeError):
+        prompt_engine._dumps(ctx)
+
+
+def test_dumps_encodes_uuid_and_enum_alike(monkeypatch):
+    ctx = {"id": uuid.UUID(int=1), "color": Color.RED}
+    fast = prompt_engine._dumps(ctx)
+    monkeypatch.setattr(prompt_engine, "orjson", None)
+    assert prompt_engine._dumps(ctx) == fast
+    assert '"id": "00000000-0000-0000-0000-000000000001"' in fast
+    assert '"color": "red"' in fast
+
+
+def test_dumps_rejects_what_stdlib_rejects():
+    with pytest.raises(TypeError):
+        prompt_engine._dumps({1: "a", "b": 2})
@@ -8,28 +8,17 @@ import pytest
 from src.huntlens import repo_fetcher
 
 
-@pytest.mark.skip(reason="Avoid hitting GitHub during local test runs")
+@pytest.mark.network
 def test_fetch_invalid_repo():
-    # This would trigger GitHub auth prompts; skipped for local/CI safety.
+    # Hits GitHub (no credential prompt: GIT_TERMINAL_PROMPT=0); opt in with
+    # --run-network.
     with pytest.raises(ValueError):
         repo_fetcher.fetch_repo_snapshot("https://github.com/not-a-real-user/not-a-real-repo")
 
 
-def test_fetch_and_cleanup(tmp_path):
-    # Create a dummy git repo locally
-    repo_dir = tmp_path / "dummy_repo"
-    repo_dir.mkdir()
-    readme = repo_dir / "README.md"
-    readme.write_text("# Dummy Repo\n\nThis is a test.")
-
-    # Init git repo (force branch to main for test consistency)
-    subprocess.run(["git", "init"], cwd=repo_dir, check=True)
-    subprocess.run(["git", "branch", "-m", "main"], cwd=repo_dir, check=True)
-    subprocess.run(["git", "add", "README.md"], cwd=repo_dir, check=True)
-    subprocess.run(["git", "commit", "-m", "init"], cwd=repo_dir, check=True)
-
+def test_fetch_and_cleanup(dummy_git_repo):
     # Clone it back via file://
-    snapshot = repo_fetcher.fetch_repo_snapshot(f"file://{repo_dir}")
+    snapshot = repo_fetcher.fetch_repo_snapshot(f"file://{dummy_git_repo}")
     assert snapshot["readme"] is not None
     assert "README.md" in snapshot["files"]
     assert isinstance(snapshot["commits"], list)
@@ -37,3 +26,101 @@ def test_fetch_and_cleanup(tmp_path):
     # Cleanup
     repo_fetcher.cleanup_repo(snapshot["path"])
     assert not os.path.exists(snapshot["path"])
+
+
+def test_fetch_missing_branch_falls_back(dummy_git_repo):
+    snapshot = repo_fetcher.fetch_repo_snapshot(
+        f"file://{dummy_git_repo}", branch="no-such-branch", max_commits=1
+    )
+    try:
+        assert snapshot["readme"].startswith("# Dummy Repo")
+        assert snapshot["files"] == ["README.md"]
+        assert snapshot["commits"] == ["init"]
+    finally:
+        repo_fetcher.cleanup_repo(snapshot["path"])
+
+
+def test_cat_file_skips_oversized_blob(dummy_git_repo):
+    with repo_fetcher._CatFile(str(dummy_git_repo)) as cat:
+        assert cat.read_blob("HEAD:README.md", max_bytes=5) is None
+        # The skipped body was drained, so the next read is still in sync.
+        assert cat.read_blob("HEAD:README.md").startswith(b"# Dummy Repo")
+        assert cat.read_blob("HEAD:missing.md") is None
+
+
+def test_git_cli_fallback_matches(dummy_git_repo, monkeypatch):
+    repo_dir = str(dummy_git_repo)
+    files = repo_fetcher._list_files(repo_dir)
+    commits = repo_fetcher._recent_commits(repo_dir, 5)
+    monkeypatch.setattr(repo_fetcher, "pygit2", None)
+    assert repo_fetcher._list_files(repo_dir) == files == ["README.md"]
+    assert repo_fetcher._recent_commits(repo_dir, 5) == commits == ["init"]
+
+
+def test_large_readme_is_skipped(dummy_git_repo, monkeypatch):
+    # Shrink the limit rather than committing a 1 MiB fixture.
+    monkeypatch.setattr(repo_fetcher, "MAX_README_BYTES", 5)
+    snapshot = repo_fetcher.fetch_repo_snapshot(f"file://{dummy_git_repo}")
+    try:
+        assert snapshot["readme"] is None
+        assert snapshot["files"] == ["README.md"]
+    finally:
+        repo_fetcher.cleanup_repo(snapshot["path"])
+
+
+def test_cleanup_accepts_pathlike(tmp_path):
+    repo_dir = tmp_path / "clone"
+    (repo_dir / ".git").mkdir(parents=True)
+    repo_fetcher.cleanup_repo(repo_dir)
+    assert not repo_dir.exists()
+
+
+@pytest.mark.parametrize("path", ["", os.sep])
+def test_cleanup_refuses_root(path):
+    with pytest.raises(ValueError):
+        repo_fetcher.cleanup_repo(path)
+
+
+def test_cat_file_is_killed_after_timeout(dummy_git_repo, monkeypatch):
+    monkeypatch.setattr(repo_fetcher, "GIT_TIMEOUT", 0.05)
+    with repo_fetcher._CatFile(str(dummy_git_repo)) as cat:
+        cat._proc.wait(timeout=5)  # the watchdog kills the idle process
+        assert cat.read_blob("HEAD:README.md") is None
+
+
+@pytest.fixture(scope="module")
+def latin1_git_repo(tmp_path_factory):
+    # A tracked file name and a commit message that are not valid UTF-8.
+    repo_dir = tmp_path_factory.mktemp("latin1_repo")
+    with open(os.path.join(os.fsencode(repo_dir), b"caf\xe9.txt"), "wb") as fh:
+        fh.write(b"x")
+    # `git commit` would re-encode the message as UTF-8, so write the commit
+    # object by hand with the raw Latin-1 bytes.
+    subprocess.run(
+        [
+            "bash", "-c",
+            "set -e; git init -q; git add -A; "
+            "tree=$(git write-tree); "
+            "printf 'tree %s\\nauthor t <t@t> 0 +0000\\ncommitter t <t@t> 0 +0000"
+            "\\n\\ncaf\\351 commit\\n' \"$tree\" "
+            "| git hash-object -t commit -w --stdin | xargs git update-ref HEAD",
+        ],
+        cwd=repo_dir,
+        check=True,
+        env={**os.environ, "GIT_CONFIG_GLOBAL": "/dev/null"},
+    )
+    return repo_dir
+
+
+@pytest.mark.parametrize("backend", ["pygit2", "cli"])
+def test_non_utf8_names_and_messages(latin1_git_repo, monkeypatch, backend):
+    if backend == "cli":
+        monkeypatch.setattr(repo_fetcher, "pygit2", None)
+    elif repo_fetcher.pygit2 is None:
+        pytest.skip("pygit2 not installed")
+    snapshot = repo_fetcher.fetch_repo_snapshot(f"file://{latin1_git_repo}")
+    try:
+        assert snapshot["files"] == ["caf\udce9.txt"]
+        assert snapshot["commits"] == ["caf\ufffd commit"]
+    finally:
+        repo_fetcher.cleanup_repo(snapshot["path"])
@@ -7,12 +7,14 @@ import json
 import pytest
 from src.huntlens import retriever
 
+
 def test_load_corpus():
     docs = retriever.load_corpus()
     assert isinstance(docs, list)
     assert all("content" in d for d in docs)
 
-def test_search_mimikatz(tmp_path):
+
+def test_search_mimikatz(tmp_path, monkeypatch):
     # Create fake doc
     doc_path = tmp_path / "mimikatz.json"
     fake_doc = {"artifact": "mimikatz", "description": "Credential dumping"}
@@ -20,16 +22,101 @@ def test_search_mimikatz(tmp_path):
         json.dump(fake_doc, f)
 
     # Patch DATA_DIRS
-    retriever.DATA_DIRS = [str(tmp_path)]
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
 
     results = retriever.search("mimikatz")
     assert results
     assert results[0]["id"] == "mimikatz.json"
     assert "content" in results[0]
 
-def test_search_no_match(tmp_path):
-    retriever.DATA_DIRS = [str(tmp_path)]
+
+def test_search_no_match(tmp_path, monkeypatch):
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
     results = retriever.search("notfound")
     assert results == []
 
 
+def test_load_corpus_reloads_on_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+    doc_path = tmp_path / "a.json"
+    doc_path.write_text(json.dumps({"artifact": "first"}))
+    assert retriever.search("first")
+
+    doc_path.write_text(json.dumps({"artifact": "second", "note": "changed"}))
+    assert retriever.search("second")
+    assert retriever.search("first") == []
+
+
+def test_search_ranks_by_tokens(tmp_path, monkeypatch):
+    (tmp_path / "hit.json").write_text(
+        json.dumps({"tool": "mimikatz", "note": "dumping creds"})
+    )
+    (tmp_path / "miss.json").write_text(json.dumps({"tool": "mimikatz"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+
+    # Tokens match even though the phrase never appears verbatim.
+    results = retriever.search("dumping mimikatz")
+    assert [r["id"] for r in results] == ["hit.json"]
+
+
+def test_load_corpus_is_cached(tmp_path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"artifact": "cached"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+
+    corpus = retriever._corpus()
+    assert retriever.load_corpus()[0]["content"] == {"artifact": "cached"}
+    assert retriever._corpus() is corpus
+
+    retriever.load_corpus.cache_clear()
+    assert retriever._corpus() is not corpus
+
+
+def test_results_do_not_alias_the_cache(tmp_path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"artifact": "mimikatz"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+
+    retriever.search("mimikatz")[0]["content"]["artifact"] = "changed"
+    retriever.load_corpus()[0]["content"]["artifact"] = "changed"
+    assert retriever.load_corpus()[0]["content"] == {"artifact": "mimikatz"}
+    assert retriever.search("changed") == []
+    assert [r["id"] for r in retriever.search("mimikatz")] == ["a.json"]
+
+
+def test_search_matches_non_ascii_text(tmp_path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"note": "Überwachung"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+
+    # Search text keeps non-ASCII characters instead of \u escapes.
+    assert [r["id"] for r in retriever.search("überwachung")] == ["a.json"]
+
+
+def test_search_keeps_substring_matches(tmp_path, monkeypatch):
+    (tmp_path / "a.json").write_text(json.dumps({"artifact": "mimikatz"}))
+    (tmp_path / "b.json").write_text(
+        json.dumps({"description": "Dumped creds via mimikatz.exe on host"})
+    )
+    (tmp_path / "c.json").write_text(
+        json.dumps({"description": "Seen running Mimikatz."})
+    )
+    (tmp_path / "d.json").write_text(json.dumps({"description": "unrelated"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+
+    results = retriever.search("mimikatz", 5)
+    assert results[0]["id"] == "a.json"  # whole-token hit ranks first
+    assert sorted(r["id"] for r in results) == ["a.json", "b.json", "c.json"]
+    assert [r["match_kind"] for r in results] == ["token", "substring", "substring"]
+    # The documented sort key reproduces the result order.
+    key = [(r["match_kind"] == "token", r["match_score"]) for r in results]
+    assert key == sorted(key, reverse=True)
+
+
+def test_corpus_cache_replaces_stale_entry(tmp_path, monkeypatch):
+    doc_path = tmp_path / "a.json"
+    doc_path.write_text(json.dumps({"artifact": "first"}))
+    monkeypatch.setattr(retriever, "DATA_DIRS", [str(tmp_path)])
+    retriever.load_corpus.cache_clear()
+
+    retriever.load_corpus()
+    doc_path.write_text(json.dumps({"artifact": "second", "note": "changed"}))
+    assert retriever.load_corpus()[0]["content"]["artifact"] == "second"
+    assert list(retriever._corpus_cache) == [(str(tmp_path),)]
@@ -2,10 +2,29 @@
 Tests for schema.py
 """
 
+import copy
+import json
 import pytest
-from jsonschema import ValidationError
+from jsonschema import SchemaError, ValidationError
 from src.huntlens import schema
 
+# Shared read-only fixtures; tests build variants with {**d, ...} or deepcopy.
+VALID_PLAYBOOK = {
+    "artifact": "mimikatz.exe",
+    "artifact_type": "process",
+    "nist_phase_playbook": {
+        "detection": [],
+        "analysis": [],
+        "containment": [],
+        "eradication": [],
+        "recovery": [],
+        "post_incident": []
+    },
+    "references": []
+}
+MISSING_REQUIRED = {k: v for k, v in VALID_PLAYBOOK.items() if k != "references"}
+EXTRA_FIELD = {**VALID_PLAYBOOK, "unexpected": True}
+
 
 def test_get_schema_returns_dict():
     s = schema.get_schema()
@@ -14,25 +33,79 @@ def test_get_schema_returns_dict():
 
 
 def test_ensure_schema_accepts_valid_object():
-    valid_obj = {
-        "artifact": "mimikatz.exe",
-        "artifact_type": "process",
-        "nist_phase_playbook": {
-            "detection": [],
-            "analysis": [],
-            "containment": [],
-            "eradication": [],
-            "recovery": [],
-            "post_incident": []
-        },
-        "references": []
-    }
-
-    result = schema.ensure_schema(valid_obj)
-    assert result == valid_obj
-
-
-def test_ensure_schema_rejects_invalid_object():
-    invalid_obj = {"not_in_schema": "oops"}
+    result = schema.ensure_schema(VALID_PLAYBOOK)
+    assert result == VALID_PLAYBOOK
+
+
+@pytest.mark.parametrize(
+    "bad",
+    [
+        {"not_in_schema": "oops"},
+        {"artifact_type": "process", "nist_phase_playbook": {}},
+        MISSING_REQUIRED,
+        EXTRA_FIELD,
+    ],
+    ids=["unknown-only", "mostly-empty", "missing-required", "extra-field"],
+)
+def test_ensure_schema_rejects_invalid_object(bad):
+    with pytest.raises(ValidationError):
+        schema.ensure_schema(bad)
+
+
+def test_ensure_schema_bytes_parses_and_validates():
+    buf = json.dumps(VALID_PLAYBOOK).encode("utf-8")
+    assert schema.ensure_schema_bytes(buf) == VALID_PLAYBOOK
     with pytest.raises(ValidationError):
-        schema.ensure_schema(invalid_obj)
+        schema.ensure_schema_bytes(json.dumps(EXTRA_FIELD).encode("utf-8"))
+    with pytest.raises(ValueError):
+        schema.ensure_schema_bytes(b"{not json")
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_validator_paths_agree(fast, monkeypatch):
+    if not fast:
+        monkeypatch.setattr(schema, "_fast_validate", None)
+    assert schema.ensure_schema(VALID_PLAYBOOK) == VALID_PLAYBOOK
+    for bad in [
+        MISSING_REQUIRED,
+        EXTRA_FIELD,
+        {**VALID_PLAYBOOK, "references": ("a",)},  # tuples are not arrays
+    ]:
+        with pytest.raises(ValidationError):
+            schema.ensure_schema(bad)
+        assert schema.collect_errors(bad)
+
+
+def test_collect_errors_reports_every_violation():
+    errors = schema.collect_errors({"not_in_schema": "oops"})
+    assert len(errors) > 1
+    assert all(isinstance(e, ValidationError) for e in errors)
+    assert schema.collect_errors(VALID_PLAYBOOK) == []
+
+
+def test_reset_validator_picks_up_schema_changes(monkeypatch):
+    obj = {**VALID_PLAYBOOK, "artifact_type": "custom"}
+    enum = schema.get_schema()["properties"]["artifact_type"]["enum"]
+    monkeypatch.setattr(schema, "_schema", copy.deepcopy(schema.get_schema()))
+    schema.get_schema()["properties"]["artifact_type"]["enum"] = enum + ["custom"]
+    try:
+        with pytest.raises(ValidationError):
+            schema.ensure_schema(obj)  # cached validator still uses the old enum
+        schema.reset_validator()
+        assert schema.ensure_schema(obj) == obj
+    finally:
+        monkeypatch.undo()
+        schema.reset_validator()
+    with pytest.raises(ValidationError):
+        schema.ensure_schema(obj)
+
+
+def test_reset_validator_rejects_invalid_schema(monkeypatch):
+    monkeypatch.setattr(schema, "_schema", {"type": 5})
+    try:
+        with pytest.raises(SchemaError):
+            schema.reset_validator()
+    finally:
+        monkeypatch.undo()
+        schema.reset_validator()
+    assert schema.ensure_schema(VALID_PLAYBOOK) == VALID_PLAYBOOK